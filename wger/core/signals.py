@@ -19,7 +19,9 @@ import datetime
 
 # Django
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.db.models.signals import (
+    post_delete,
     post_save,
     pre_save,
 )
@@ -27,9 +29,11 @@ from django.dispatch import receiver
 
 # wger
 from wger.core.models import (
+    Language,
     UserCache,
     UserProfile,
 )
+from wger.utils.cache import cache_mapper
 from wger.utils.helpers import disable_for_loaddata
 
 
@@ -66,5 +70,14 @@ def set_user_age(sender, instance, **kwargs):
         )
 
 
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def reset_language_ids(sender, instance, **kwargs):
+    """
+    Reset the cached language IDs when a language is added or removed
+    """
+    cache.delete(cache_mapper.LANGUAGE_IDS_CACHE_KEY)
+
+
 post_save.connect(create_user_profile, sender=User)
 post_save.connect(create_user_cache, sender=User)
@@ -20,6 +20,7 @@ from collections.abc import Iterable
 # Django
 from django import template
 from django.conf import settings
+from django.core.cache import cache
 from django.templatetags.static import static
 from django.utils.html import strip_spaces_between_tags
 from django.utils.safestring import mark_safe
@@ -28,8 +29,12 @@ from django.utils.translation import (
     pgettext,
 )
 
+# Third Party
+from easy_thumbnails.templatetags.thumbnail import thumbnail_url
+
 # wger
 from wger.manager.models import Day
+from wger.utils.cache import cache_mapper
 from wger.utils.constants import (
     PAGINATION_MAX_TOTAL_PAGES,
     PAGINATION_PAGES_AROUND_CURRENT,
@@ -178,6 +183,26 @@ def get_item(dictionary, key):
     return dictionary.get(key)
 
 
+@register.filter
+def exercise_image_thumbnail(image, alias):
+    """
+    Returns the URL of an exercise image's thumbnail, like easy_thumbnails'
+    thumbnail_url filter, but cached so the thumbnail tables and the storage
+    are only checked once per image and alias. Failures (empty URLs) are not
+    cached so the thumbnail is generated again on the next request.
+    """
+    if not image:
+        return ''
+
+    cache_key = cache_mapper.get_exercise_image_thumbnail(image, alias)
+    url = cache.get(cache_key)
+    if not url:
+        url = thumbnail_url(image.image, alias)
+        if url:
+            cache.set(cache_key, url)
+    return url
+
+
 @register.filter
 def minus(a, b):
     """
@@ -28,6 +28,7 @@ from wger.core.tests.base_testcase import (
     WgerEditTestCase,
     WgerTestCase,
 )
+from wger.utils.cache import get_language_ids
 
 
 class LanguageRepresentationTestCase(WgerTestCase):
@@ -42,6 +43,28 @@ class LanguageRepresentationTestCase(WgerTestCase):
         self.assertEqual(f"{Language.objects.get(pk=1)}", 'Deutsch (de)')
 
 
+class LanguageIdsCacheTestCase(WgerTestCase):
+    """
+    Test the cached list of language IDs
+    """
+
+    def test_cache_reset(self):
+        """
+        Test that the cached IDs are updated when adding or deleting a language
+        """
+        self.assertEqual(
+            sorted(get_language_ids()),
+            sorted(Language.objects.values_list('id', flat=True)),
+        )
+
+        language = Language.objects.create(short_name='xx', full_name='Test')
+        self.assertIn(language.pk, get_language_ids())
+
+        language_id = language.pk
+        language.delete()
+        self.assertNotIn(language_id, get_language_ids())
+
+
 class LanguageOverviewTest(WgerAccessTestCase):
     """
     Tests accessing the system's languages
@@ -17,9 +17,18 @@
 
 # Standard Library
 import logging
+import re
 
 # Django
 from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import (
+    F,
+    Prefetch,
+    Q,
+)
+from django.utils import translation
 from django.utils.decorators import method_decorator
 from django.utils.translation import gettext as _
 from django.views.decorators.cache import cache_page
@@ -59,6 +68,10 @@ from wger.exercises.models import (
     ExerciseVideo,
     Muscle,
 )
+from wger.utils.cache import (
+    cache_mapper,
+    get_exercise_search_version,
+)
 from wger.utils.language import (
     load_item_languages,
     load_language,
@@ -68,6 +81,12 @@ from wger.utils.permissions import CreateOnlyPermission
 
 logger = logging.getLogger(__name__)
 
+ID_PATTERN = re.compile(r'\d+')
+ID_LIST_PATTERN = re.compile(r'\d+(,\d+)*')
+
+# Exercise columns that none of the API serializers render
+EXERCISE_DEFERRED_FIELDS = ('name_original', 'description_clean')
+
 
 class ExerciseBaseViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -105,6 +124,15 @@ class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
         'name',
     )
 
+    base_filters = (
+        ('category', 'exercise_base__category_id__in', ID_PATTERN),
+        ('muscles', 'exercise_base__muscles__in', ID_LIST_PATTERN),
+        ('muscles_secondary', 'exercise_base__muscles_secondary__in', ID_LIST_PATTERN),
+        ('equipment', 'exercise_base__equipment__in', ID_LIST_PATTERN),
+        ('license', 'exercise_base__license_id__in', ID_PATTERN),
+    )
+    """Query parameters for fields from the exercise base and their lookups"""
+
     # @method_decorator(cache_page(settings.WGER_SETTINGS['EXERCISE_CACHE_TTL']))
     def dispatch(self, request, *args, **kwargs):
         return super().dispatch(request, *args, **kwargs)
@@ -122,44 +150,21 @@ class ExerciseViewSet(viewsets.ReadOnlyModelViewSet):
     def get_queryset(self):
         """Add additional filters for fields from exercise base"""
 
-        qs = Exercise.objects.accepted()
-
-        category = self.request.query_params.get('category')
-        muscles = self.request.query_params.get('muscles')
-        muscles_secondary = self.request.query_params.get('muscles_secondary')
-        equipment = self.request.query_params.get('equipment')
-        license = self.request.query_params.get('license')
-
-        if category:
-            try:
-                qs = qs.filter(exercise_base__category_id=int(category))
-            except ValueError:
-                logger.info(f"Got {category} as category ID")
-
-        if muscles:
-            try:
-                qs = qs.filter(exercise_base__muscles__in=[int(m) for m in muscles.split(',')])
-            except ValueError:
-                logger.info(f"Got {muscles} as muscle IDs")
-
-        if muscles_secondary:
-            try:
-                muscle_ids = [int(m) for m in muscles_secondary.split(',')]
-                qs = qs.filter(exercise_base__muscles_secondary__in=muscle_ids)
-            except ValueError:
-                logger.info(f"Got '{muscles_secondary}' as secondary muscle IDs")
-
-        if equipment:
-            try:
-                qs = qs.filter(exercise_base__equipment__in=[int(e) for e in equipment.split(',')])
-            except ValueError:
-                logger.info(f"Got {equipment} as equipment IDs")
-
-        if license:
-            try:
-                qs = qs.filter(exercise_base__license_id=int(license))
-            except ValueError:
-                logger.info(f"Got {license} as license ID")
+        qs = Exercise.objects.accepted().defer(*EXERCISE_DEFERRED_FIELDS)
+
+        filters = Q()
+        for param, lookup, pattern in self.base_filters:
+            value = self.request.query_params.get(param)
+            if not value:
+                continue
+
+            if not pattern.fullmatch(value):
+                logger.info(f"Got '{value}' as {param} ID(s)")
+                continue
+            filters &= Q(**{lookup: [int(i) for i in value.split(',')]})
+
+        if filters:
+            qs = qs.filter(filters).distinct()
 
         return qs
 
@@ -176,37 +181,65 @@ def search(request):
     json_response = {}
 
     if q:
-        languages = load_item_languages(
-            LanguageConfig.SHOW_ITEM_EXERCISES, language_code=request.GET.get('language', None)
+        language_code = request.GET.get('language', None)
+        cache_key = cache_mapper.get_exercise_search(
+            get_exercise_search_version(),
+            translation.get_language(),
+            language_code,
+            q,
         )
-        exercises = (
-            Exercise.objects.filter(name__icontains=q).filter(language__in=languages).filter(
-                status=Exercise.STATUS_ACCEPTED
-            ).order_by('exercise_base__category__name', 'name').distinct()
-        )
-
-        for exercise in exercises:
-            if exercise.main_image:
-                image_obj = exercise.main_image
-                image = image_obj.image.url
-                t = get_thumbnailer(image_obj.image)
-                thumbnail = t.get_thumbnail(aliases.get('micro_cropped')).url
-            else:
-                image = None
-                thumbnail = None
-
+        cached_response = cache.get(cache_key)
+        if cached_response is not None:
+            return Response(cached_response)
+
+        languages = load_item_languages(LanguageConfig.SHOW_ITEM_EXERCISES, language_code)
+        exercises = Exercise.objects.annotate(
+            category_name=F('exercise_base__category__name'),
+            main_image_url=F('exercise_base__main_image_url'),
+            main_image_thumbnail_url=F('exercise_base__main_image_thumbnail_url'),
+        ).filter(language__in=languages).filter(status=Exercise.STATUS_ACCEPTED)
+
+        # Deliberately only match terms shorter than a trigram at the start of
+        # the name, a substring search returns too many unrelated hits for them
+        # (e.g. "up" no longer matches "Pull-up"). Neither index helps here.
+        if len(q) < 3:
+            exercises = exercises.filter(name__istartswith=q)
+        else:
+            exercises = exercises.filter(name__icontains=q)
+
+        # On PostgreSQL, rank the hits within a category by their similarity
+        if connection.vendor == 'postgresql':
+            # Needs psycopg2, so it can't be imported in global scope
+            # Django
+            from django.contrib.postgres.search import TrigramSimilarity
+
+            exercises = exercises.annotate(similarity=TrigramSimilarity('name', q)).order_by(
+                'category_name', '-similarity', 'name'
+            )
+        else:
+            exercises = exercises.order_by('category_name', 'name')
+        exercises = exercises.values(
+            'id',
+            'name',
+            'category_name',
+            'main_image_url',
+            'main_image_thumbnail_url',
+        ).distinct()
+
+        for exercise in exercises.iterator(chunk_size=200):
             exercise_json = {
-                'value': exercise.name,
+                'value': exercise['name'],
                 'data': {
-                    'id': exercise.id,
-                    'name': exercise.name,
-                    'category': _(exercise.category.name),
-                    'image': image,
-                    'image_thumbnail': thumbnail
+                    'id': exercise['id'],
+                    'name': exercise['name'],
+                    'category': _(exercise['category_name']),
+                    'image': exercise['main_image_url'],
+                    'image_thumbnail': exercise['main_image_thumbnail_url']
                 }
             }
             results.append(exercise_json)
         json_response['suggestions'] = results
+        cache.set(cache_key, json_response, settings.WGER_SETTINGS['EXERCISE_CACHE_TTL'])
 
     return Response(json_response)
 
@@ -217,7 +250,7 @@ class ExerciseInfoViewset(viewsets.ReadOnlyModelViewSet):
     structures for more easy parsing.
     """
 
-    queryset = Exercise.objects.accepted()
+    queryset = Exercise.objects.accepted().defer(*EXERCISE_DEFERRED_FIELDS)
     serializer_class = ExerciseInfoSerializer
     ordering_fields = '__all__'
     filterset_fields = (
@@ -240,7 +273,18 @@ class ExerciseBaseInfoViewset(viewsets.ReadOnlyModelViewSet):
     base. Returns nested data structures for more easy and faster parsing.
     """
 
-    queryset = ExerciseBase.objects.accepted()
+    queryset = ExerciseBase.objects.accepted().select_related(
+        'category',
+        'license',
+    ).prefetch_related(
+        'muscles',
+        'muscles_secondary',
+        'equipment',
+        'exerciseimage_set',
+        Prefetch('exercises', queryset=Exercise.objects.defer(*EXERCISE_DEFERRED_FIELDS)),
+        'exercises__alias_set',
+        'exercises__exercisecomment_set',
+    )
     serializer_class = ExerciseBaseInfoSerializer
     ordering_fields = '__all__'
     filterset_fields = (
@@ -304,13 +348,26 @@ class ExerciseImageViewSet(viewsets.ModelViewSet):
         except ExerciseImage.DoesNotExist:
             return Response([])
 
+        # Read all cached URLs at once and only ask the thumbnailer for the
+        # missing ones
+        all_aliases = aliases.all()
+        keys = {
+            alias: cache_mapper.get_exercise_image_thumbnail(image, alias)
+            for alias in all_aliases
+        }
+        cached_urls = cache.get_many(keys.values())
+        thumbnailer = get_thumbnailer(image.image)
+
         thumbnails = {}
-        for alias in aliases.all():
-            t = get_thumbnailer(image.image)
-            thumbnails[alias] = {
-                'url': t.get_thumbnail(aliases.get(alias)).url,
-                'settings': aliases.get(alias)
-            }
+        new_urls = {}
+        for alias, options in all_aliases.items():
+            url = cached_urls.get(keys[alias])
+            if url is None:
+                url = thumbnailer.get_thumbnail(options).url
+                new_urls[keys[alias]] = url
+            thumbnails[alias] = {'url': url, 'settings': options}
+        cache.set_many(new_urls)
+
         thumbnails['original'] = image.image.url
         return Response(thumbnails)
 
@@ -318,10 +375,10 @@ class ExerciseImageViewSet(viewsets.ModelViewSet):
         """
         Set the license data
         """
-        obj = serializer.save()
-        # Todo is it right to call set author after save?
-        obj.set_author(self.request)
-        obj.save()
+        image = ExerciseImage(**serializer.validated_data)
+        image.set_author(self.request)
+        image.save()
+        serializer.instance = image
 
 
 class ExerciseVideoViewSet(viewsets.ReadOnlyModelViewSet):
@@ -352,8 +409,10 @@ class ExerciseCommentViewSet(viewsets.ReadOnlyModelViewSet):
         qs = ExerciseComment.objects.all()
         language = self.request.query_params.get('language')
         if language:
-            exercises = Exercise.objects.filter(language=language)
-            qs = ExerciseComment.objects.filter(exercise__in=exercises)
+            if ID_PATTERN.fullmatch(language):
+                qs = qs.filter(exercise__language_id=int(language))
+            else:
+                logger.info(f"Got '{language}' as language ID")
         return qs
 
 
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.13 on 2022-06-20 18:12
+
+from django.db import migrations
+
+# The index is built on the same expression Django uses for icontains lookups
+# on PostgreSQL, so that the planner can use it for the exercise search
+CREATE_INDEX = (
+    'CREATE INDEX IF NOT EXISTS exercises_exercise_name_trgm '
+    'ON exercises_exercise USING gin ((UPPER(name::text)) gin_trgm_ops)'
+)
+DROP_INDEX = 'DROP INDEX IF EXISTS exercises_exercise_name_trgm'
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(CREATE_INDEX)
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(DROP_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0017_muscle_name_en'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.13 on 2022-06-21 20:41
+
+from django.db import migrations, models
+
+
+def set_main_image_urls(apps, schema_editor):
+    """
+    Stores the URLs of the current main images on the exercise bases, the
+    thumbnail URLs are filled in by migration 0022
+    """
+    ExerciseImage = apps.get_model('exercises', 'ExerciseImage')
+    ExerciseBase = apps.get_model('exercises', 'ExerciseBase')
+
+    for image in ExerciseImage.objects.filter(status='2', is_main=True):
+        ExerciseBase.objects.filter(pk=image.exercise_base_id).update(
+            main_image_url=image.image.url
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0018_exercise_name_trigram_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercisebase',
+            name='main_image_thumbnail_url',
+            field=models.URLField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='exercisebase',
+            name='main_image_url',
+            field=models.URLField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(set_main_image_urls, migrations.RunPython.noop),
+    ]
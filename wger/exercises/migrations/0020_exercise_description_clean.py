@@ -0,0 +1,31 @@
+# Generated by Django 3.2.13 on 2022-06-23 19:26
+
+from django.db import migrations, models
+
+import bleach
+
+
+def set_description_clean(apps, schema_editor):
+    """
+    Stores the cleaned description for the existing exercises
+    """
+    Exercise = apps.get_model('exercises', 'Exercise')
+    for exercise in Exercise.objects.all():
+        exercise.description_clean = bleach.clean(exercise.description, strip=True)
+        exercise.save(update_fields=['description_clean'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0019_exercisebase_main_image_urls'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exercise',
+            name='description_clean',
+            field=models.TextField(default='', editable=False),
+        ),
+        migrations.RunPython(set_description_clean, migrations.RunPython.noop),
+    ]
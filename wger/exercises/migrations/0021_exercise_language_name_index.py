@@ -0,0 +1,17 @@
+# Generated by Django 3.2.13 on 2022-06-24 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0020_exercise_description_clean'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='exercise',
+            index=models.Index(fields=['language', 'name'], name='ex_lang_name_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 3.2.13 on 2022-06-25 11:08
+
+from django.db import migrations, models
+
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.exceptions import InvalidImageFormatError
+from easy_thumbnails.files import get_thumbnailer
+
+
+def set_thumbnail_micro_urls(apps, schema_editor):
+    """
+    Stores the URL of the micro_cropped thumbnail for the existing images and
+    copies it to the exercise base for the main images
+    """
+    ExerciseImage = apps.get_model('exercises', 'ExerciseImage')
+    ExerciseBase = apps.get_model('exercises', 'ExerciseBase')
+
+    for image in ExerciseImage.objects.all():
+        thumbnailer = get_thumbnailer(image.image)
+        try:
+            thumbnail_url = thumbnailer.get_thumbnail(aliases.get('micro_cropped')).url
+        except (InvalidImageFormatError, OSError):
+            continue
+
+        ExerciseImage.objects.filter(pk=image.pk).update(thumbnail_micro_url=thumbnail_url)
+        if image.status == '2' and image.is_main:
+            ExerciseBase.objects.filter(pk=image.exercise_base_id).update(
+                main_image_thumbnail_url=thumbnail_url
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exercises', '0021_exercise_language_name_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exerciseimage',
+            name='thumbnail_micro_url',
+            field=models.URLField(blank=True, editable=False, max_length=255, null=True),
+        ),
+        migrations.RunPython(set_thumbnail_micro_urls, migrations.RunPython.noop),
+    ]
@@ -83,6 +83,22 @@ class ExerciseBase(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
     )
     """Variations of this exercise"""
 
+    main_image_url = models.URLField(
+        max_length=255,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    """URL of the main image, kept up to date when the images change"""
+
+    main_image_thumbnail_url = models.URLField(
+        max_length=255,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    """URL of the main image's micro_cropped thumbnail"""
+
     #
     # Own methods
     #
@@ -15,12 +15,18 @@
 #  along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 # Django
-from django.db import models
+from django.db import (
+    models,
+    transaction,
+)
 from django.utils.translation import gettext_lazy as _
 
 # wger
-from wger.core.models import Language
-from wger.utils.cache import delete_template_fragment_cache
+from wger.utils.cache import (
+    delete_template_fragment_caches,
+    get_language_ids,
+    reset_exercise_search,
+)
 
 
 class ExerciseCategory(models.Model):
@@ -59,14 +65,14 @@ class ExerciseCategory(models.Model):
         super(ExerciseCategory, self).save(*args, **kwargs)
 
         # Cached template fragments
-        for language in Language.objects.all():
-            delete_template_fragment_cache('exercise-overview', language.id)
+        delete_template_fragment_caches(('exercise-overview', ), get_language_ids())
+        reset_exercise_search()
 
     def delete(self, *args, **kwargs):
         """
         Reset all cached infos
         """
-        for language in Language.objects.all():
-            delete_template_fragment_cache('exercise-overview', language.id)
-
         super(ExerciseCategory, self).delete(*args, **kwargs)
+
+        delete_template_fragment_caches(('exercise-overview', ), get_language_ids())
+        transaction.on_commit(reset_exercise_search)
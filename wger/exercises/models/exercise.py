@@ -23,21 +23,23 @@ from django.contrib.auth.models import User
 from django.contrib.sites.models import Site
 from django.core import mail
 from django.core.validators import MinLengthValidator
-from django.db import models
+from django.db import (
+    models,
+    transaction,
+)
 from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import translation
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
-# Third Party
-import bleach
-
 # wger
 from wger.core.models import Language
 from wger.exercises.models import ExerciseBase
 from wger.utils.cache import (
-    delete_template_fragment_cache,
+    delete_template_fragment_caches,
+    get_language_ids,
+    reset_exercise_search,
     reset_workout_canonical_form,
 )
 from wger.utils.helpers import smart_capitalize
@@ -63,6 +65,12 @@ class Exercise(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
     )
     """Description on how to perform the exercise"""
 
+    description_clean = models.TextField(
+        default='',
+        editable=False,
+    )
+    """The description with the tags not allowed by bleach stripped, set automatically on save"""
+
     name = models.CharField(max_length=200, verbose_name=_('Name'))
     """The exercise's name, with correct uppercase"""
 
@@ -113,6 +121,9 @@ class Exercise(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         ordering = [
             "name",
         ]
+        indexes = [
+            models.Index(fields=['language', 'name'], name='ex_lang_name_idx'),
+        ]
 
     def get_absolute_url(self):
         """
@@ -128,31 +139,35 @@ class Exercise(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         super(Exercise, self).save(*args, **kwargs)
 
         # Cached template fragments
-        for language in Language.objects.all():
-            delete_template_fragment_cache('muscle-overview', language.id)
-            delete_template_fragment_cache('exercise-overview', language.id)
-            delete_template_fragment_cache('equipment-overview', language.id)
+        delete_template_fragment_caches(
+            ('muscle-overview', 'exercise-overview', 'equipment-overview'),
+            get_language_ids(),
+        )
+        reset_exercise_search()
 
         # Cached workouts
-        for setting in self.setting_set.all():
-            reset_workout_canonical_form(setting.set.exerciseday.training_id)
+        for workout_id in self.get_workout_ids():
+            reset_workout_canonical_form(workout_id)
 
     def delete(self, *args, **kwargs):
         """
         Reset all cached infos
         """
+        workout_ids = self.get_workout_ids()
+        super(Exercise, self).delete(*args, **kwargs)
 
         # Cached template fragments
-        for language in Language.objects.all():
-            delete_template_fragment_cache('muscle-overview', language.id)
-            delete_template_fragment_cache('exercise-overview', language.id)
-            delete_template_fragment_cache('equipment-overview', language.id)
+        delete_template_fragment_caches(
+            ('muscle-overview', 'exercise-overview', 'equipment-overview'),
+            get_language_ids(),
+        )
 
-        # Cached workouts
-        for setting in self.setting_set.all():
-            reset_workout_canonical_form(setting.set.exerciseday.training.pk)
+        # Cached search results, only once the row is gone for good
+        transaction.on_commit(reset_exercise_search)
 
-        super(Exercise, self).delete(*args, **kwargs)
+        # Cached workouts
+        for workout_id in workout_ids:
+            reset_workout_canonical_form(workout_id)
 
     def __str__(self):
         """
@@ -192,12 +207,16 @@ class Exercise(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         """
         Returns the variations for this exercise in the same language
         """
-        out = []
-        if self.exercise_base.variations:
-            for variation in self.exercise_base.variations.exercisebase_set.all():
-                for exercise in variation.exercises.filter(language=self.language).accepted():
-                    out.append(exercise)
-        return out
+        variations_id = self.exercise_base.variations_id
+        if not variations_id:
+            return []
+
+        return list(
+            Exercise.objects.accepted().filter(
+                exercise_base__variations_id=variations_id,
+                language_id=self.language_id,
+            )
+        )
 
     #
     # Own methods
@@ -209,12 +228,11 @@ class Exercise(AbstractSubmissionModel, AbstractLicenseModel, models.Model):
         """
         return self.images.accepted().filter(is_main=True).first()
 
-    @property
-    def description_clean(self):
+    def get_workout_ids(self):
         """
-        Return the exercise description with all markup removed
+        Returns the IDs of the workouts that use this exercise
         """
-        return bleach.clean(self.description, strip=True)
+        return set(self.setting_set.values_list('set__exerciseday__training_id', flat=True))
 
     def get_owner_object(self):
         """
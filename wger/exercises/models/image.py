@@ -24,9 +24,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 
 # wger
-from wger.core.models import Language
 from wger.exercises.models import ExerciseBase
-from wger.utils.cache import delete_template_fragment_cache
 from wger.utils.managers import SubmissionManager
 from wger.utils.models import (
     AbstractLicenseModel,
@@ -104,6 +102,14 @@ class ExerciseImage(AbstractSubmissionModel, AbstractLicenseModel, models.Model)
     )
     """The art style of the image"""
 
+    thumbnail_micro_url = models.URLField(
+        max_length=255,
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    """URL of the micro_cropped thumbnail, set automatically on save"""
+
     class Meta:
         """
         Set default ordering
@@ -127,30 +133,14 @@ class ExerciseImage(AbstractSubmissionModel, AbstractLicenseModel, models.Model)
 
                 self.is_main = True
 
-        #
-        # Reset all cached infos
-        #
-        for language in Language.objects.all():
-            delete_template_fragment_cache('muscle-overview', language.id)
-            delete_template_fragment_cache('exercise-overview', language.id)
-            delete_template_fragment_cache('exercise-overview-mobile', language.id)
-            delete_template_fragment_cache('equipment-overview', language.id)
-
-        # And go on
         super(ExerciseImage, self).save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
-        Reset all cached infos
+        Make sure there is always a main image
         """
         super(ExerciseImage, self).delete(*args, **kwargs)
 
-        for language in Language.objects.all():
-            delete_template_fragment_cache('muscle-overview', language.id)
-            delete_template_fragment_cache('exercise-overview', language.id)
-            delete_template_fragment_cache('exercise-overview-mobile', language.id)
-            delete_template_fragment_cache('equipment-overview', language.id)
-
         # Make sure there is always a main image
         if not ExerciseImage.objects.accepted().filter(
             exercise_base=self.exercise_base, is_main=True
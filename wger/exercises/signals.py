@@ -15,25 +15,52 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import logging
 import pathlib
 
 # Django
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models.signals import (
     post_delete,
+    post_save,
     pre_save,
 )
 from django.dispatch import receiver
 
 # Third Party
+import bleach
+from easy_thumbnails.alias import aliases
+from easy_thumbnails.exceptions import InvalidImageFormatError
 from easy_thumbnails.files import get_thumbnailer
 from easy_thumbnails.signal_handlers import generate_aliases
 from easy_thumbnails.signals import saved_file
 
 # wger
 from wger.exercises.models import (
+    Exercise,
+    ExerciseBase,
     ExerciseImage,
     ExerciseVideo,
 )
+from wger.utils.cache import (
+    cache_mapper,
+    delete_template_fragment_caches,
+    get_language_ids,
+    reset_exercise_search,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(pre_save, sender=Exercise)
+def set_exercise_description_clean(sender, instance, **kwargs):
+    """
+    Store the description with the tags not allowed by bleach stripped, the
+    allowed inline tags are kept. This also runs when loading fixtures
+    """
+    instance.description_clean = bleach.clean(instance.description, strip=True)
 
 
 @receiver(post_delete, sender=ExerciseImage)
@@ -68,6 +95,110 @@ def delete_exercise_image_on_update(sender, instance, **kwargs):
         instance.image.delete(save=False)
 
 
+@receiver(post_save, sender=ExerciseImage)
+@receiver(post_delete, sender=ExerciseImage)
+def reset_exercise_image_thumbnail_cache(sender, instance, **kwargs):
+    """
+    Delete the cached thumbnail URLs of the image
+    """
+    cache.delete_many(
+        [cache_mapper.get_exercise_image_thumbnail(instance, alias) for alias in aliases.all()]
+    )
+
+
+def reset_exercise_caches():
+    """
+    Delete the cached overview fragments and search results that show the
+    exercise bases and their main images
+    """
+    delete_template_fragment_caches(
+        (
+            'muscle-overview',
+            'exercise-overview',
+            'exercise-overview-mobile',
+            'equipment-overview',
+        ),
+        get_language_ids(),
+    )
+    reset_exercise_search()
+
+
+def update_main_image_urls(exercise_base_id):
+    """
+    Stores the URLs of the main image and its thumbnail on the exercise base
+    """
+    image_url = None
+    thumbnail_url = None
+
+    main_image = ExerciseImage.objects.accepted().filter(
+        exercise_base_id=exercise_base_id,
+        is_main=True,
+    ).first()
+    if main_image:
+        image_url = main_image.image.url
+        thumbnail_url = main_image.thumbnail_micro_url
+
+    ExerciseBase.objects.filter(pk=exercise_base_id).update(
+        main_image_url=image_url,
+        main_image_thumbnail_url=thumbnail_url,
+    )
+
+
+@receiver(post_save, sender=ExerciseImage)
+def update_thumbnail_urls_on_save(sender, instance, **kwargs):
+    """
+    Generate the micro_cropped thumbnail and store its URL, then update the
+    main image URLs of the exercise base. The cached results are reset once
+    the transaction is committed, so they never contain the old URLs.
+
+    The URL is written with update() so that the image is not saved again.
+    This also runs when loading fixtures, images without a file simply get
+    no thumbnail URL.
+    """
+    thumbnailer = get_thumbnailer(instance.image)
+    try:
+        thumbnail_url = thumbnailer.get_thumbnail(aliases.get('micro_cropped')).url
+    except (InvalidImageFormatError, OSError):
+        logger.info(f"Could not generate a thumbnail for exercise image {instance.pk}")
+        thumbnail_url = None
+
+    instance.thumbnail_micro_url = thumbnail_url
+    ExerciseImage.objects.filter(pk=instance.pk).update(thumbnail_micro_url=thumbnail_url)
+    update_main_image_urls(instance.exercise_base_id)
+    transaction.on_commit(reset_exercise_caches)
+
+
+@receiver(post_delete, sender=ExerciseImage)
+def update_main_image_urls_on_delete(sender, instance, **kwargs):
+    """
+    Update the main image URLs of the exercise base when an image is deleted
+    and reset the cached results after the transaction is committed
+    """
+    update_main_image_urls(instance.exercise_base_id)
+    transaction.on_commit(reset_exercise_caches)
+
+
+@receiver(post_save, sender=ExerciseBase)
+def update_main_image_urls_on_base_save(sender, instance, **kwargs):
+    """
+    Recompute the main image URLs when the exercise base is saved and reset
+    the cached results, e.g. the category could have changed
+
+    This also runs when loading fixtures, which would otherwise overwrite the
+    stored URLs with the values from the fixture file.
+    """
+    update_main_image_urls(instance.pk)
+    transaction.on_commit(reset_exercise_caches)
+
+
+@receiver(post_delete, sender=ExerciseBase)
+def reset_exercise_caches_on_base_delete(sender, instance, **kwargs):
+    """
+    Reset the cached results after an exercise base is deleted
+    """
+    transaction.on_commit(reset_exercise_caches)
+
+
 # Generate thumbnails when uploading a new image
 saved_file.connect(generate_aliases)
 
@@ -19,6 +19,8 @@ import json
 from django.core import mail
 from django.core.cache import cache
 from django.core.cache.utils import make_template_fragment_key
+from django.core.files import File
+from django.core.management import call_command
 from django.template import (
     Context,
     Template,
@@ -34,7 +36,9 @@ from wger.core.tests.base_testcase import (
 )
 from wger.exercises.models import (
     Exercise,
+    ExerciseBase,
     ExerciseCategory,
+    ExerciseImage,
     Muscle,
 )
 from wger.utils.cache import cache_mapper
@@ -42,6 +46,18 @@ from wger.utils.constants import WORKOUT_TAB
 from wger.utils.helpers import random_string
 
 
+def save_image(exercise):
+    """
+    Helper function to save an image to an exercise
+    """
+    with open('wger/exercises/tests/protestschwein.jpg', 'rb') as inFile:
+        image = ExerciseImage()
+        image.exercise_base = exercise.exercise_base
+        image.status = ExerciseImage.STATUS_ACCEPTED
+        image.image.save('protestschwein.jpg', File(inFile))
+        image.save()
+
+
 class ExerciseRepresentationTestCase(WgerTestCase):
     """
     Test the representation of a model
@@ -54,6 +70,24 @@ class ExerciseRepresentationTestCase(WgerTestCase):
         self.assertEqual("{0}".format(Exercise.objects.get(pk=1)), 'An exercise')
 
 
+class ExerciseDescriptionCleanTestCase(WgerTestCase):
+    """
+    Test the cleaned description
+    """
+
+    def test_description_clean(self):
+        """
+        Test that the cleaned description is stored when saving, bleach strips
+        the tags it does not allow and keeps the allowed inline ones
+        """
+        exercise = Exercise.objects.get(pk=1)
+        exercise.description = '<p>Lift the <strong>heavy</strong> weight</p>'
+        exercise.save()
+
+        exercise = Exercise.objects.get(pk=1)
+        self.assertEqual(exercise.description_clean, 'Lift the <strong>heavy</strong> weight')
+
+
 class ExerciseShareButtonTestCase(WgerTestCase):
     """
     Test that the share button is correctly displayed and hidden
@@ -447,6 +481,30 @@ class ExercisesTestCase(WgerTestCase):
         self.user_login('test')
         self.search_exercise()
 
+    def test_search_exercise_main_image(self):
+        """
+        Test that the search returns the URLs of the main image
+        """
+        save_image(Exercise.objects.get(pk=2))
+
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(len(result['suggestions']), 1)
+        self.assertTrue(result['suggestions'][0]['data']['image'])
+        self.assertTrue(result['suggestions'][0]['data']['image_thumbnail'])
+
+    def test_main_image_urls_reload_fixtures(self):
+        """
+        Test that reloading the exercise bases from the fixtures keeps the
+        main image URLs
+        """
+        save_image(Exercise.objects.get(pk=2))
+        call_command('loaddata', 'test-exercises', verbosity=0)
+
+        base = ExerciseBase.objects.get(pk=2)
+        self.assertTrue(base.main_image_url)
+        self.assertTrue(base.main_image_thumbnail_url)
+
 
 class DeleteExercisesTestCase(WgerDeleteTestCase):
     """
@@ -512,6 +570,70 @@ class ExercisesCacheTestCase(WgerTestCase):
         self.assertNotEqual(old_exercise_overview, new_exercise_overview)
         self.assertNotEqual(old_muscle_overview, new_muscle_overview)
 
+    def test_search_cache_update(self):
+        """
+        Test that the cached search results are reset when editing an exercise
+        """
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(len(result['suggestions']), 1)
+
+        exercise = Exercise.objects.get(pk=2)
+        exercise.name_original = 'Very hot exercise'
+        exercise.save()
+
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(len(result['suggestions']), 0)
+
+    def test_search_cache_update_delete(self):
+        """
+        Test that the cached search results are reset after deleting an exercise
+        """
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(len(result['suggestions']), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Exercise.objects.get(pk=2).delete()
+
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(len(result['suggestions']), 0)
+
+    def test_search_cache_update_image(self):
+        """
+        Test that the cached search results are reset after adding an image
+        """
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertIsNone(result['suggestions'][0]['data']['image'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            save_image(Exercise.objects.get(pk=2))
+
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertTrue(result['suggestions'][0]['data']['image'])
+        self.assertTrue(result['suggestions'][0]['data']['image_thumbnail'])
+
+    def test_search_cache_update_base(self):
+        """
+        Test that the cached search results are reset when editing an exercise base
+        """
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(result['suggestions'][0]['data']['category'], 'Another category')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            base = ExerciseBase.objects.get(pk=2)
+            base.category_id = 3
+            base.save()
+
+        response = self.client.get(reverse('exercise-search'), {'term': 'cool'})
+        result = json.loads(response.content.decode('utf8'))
+        self.assertEqual(result['suggestions'][0]['data']['category'], 'Yet another category')
+
     def test_muscles_cache_update_on_delete(self):
         """
         Test that the template cache for the overview is correctly reset when
@@ -702,6 +824,35 @@ class ExerciseApiTestCase(
     private_resource = False
     overview_cached = True
 
+    def get_ids(self, query):
+        """
+        Helper function that returns the IDs of the exercises in the response
+        """
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, 200)
+        return [exercise['id'] for exercise in response.data['results']]
+
+    def test_filter_muscles(self):
+        """
+        Test filtering by several muscles, exercises matching more than one
+        are only returned once
+        """
+        ids = self.get_ids({'muscles': '1,2'})
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(sorted(ids), [1, 2, 3, 35, 81, 84, 91, 111, 126])
+
+    def test_filter_category(self):
+        """
+        Test filtering by category
+        """
+        self.assertEqual(sorted(self.get_ids({'category': 2})), [1, 2])
+
+    def test_filter_invalid_value(self):
+        """
+        Test that invalid filter values are ignored
+        """
+        self.assertEqual(sorted(self.get_ids({'equipment': '1,a'})), sorted(self.get_ids({})))
+
 
 class ExerciseInfoApiTestCase(
     api_base_test.BaseTestCase,
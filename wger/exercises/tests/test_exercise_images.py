@@ -12,10 +12,23 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 
+# Standard Library
+from unittest import mock
+
 # Django
+from django.core.cache import cache
 from django.core.files import File
+from django.db.models.signals import post_save
+from django.template import (
+    Context,
+    Template,
+)
 from django.urls import reverse
 
+# Third Party
+from easy_thumbnails.alias import aliases
+from rest_framework import status
+
 # wger
 from wger.core.tests import api_base_test
 from wger.core.tests.base_testcase import (
@@ -26,8 +39,10 @@ from wger.core.tests.base_testcase import (
 )
 from wger.exercises.models import (
     Exercise,
+    ExerciseBase,
     ExerciseImage,
 )
+from wger.utils.cache import cache_mapper
 
 
 class MainImageTestCase(WgerTestCase):
@@ -104,6 +119,40 @@ class MainImageTestCase(WgerTestCase):
         self.assertFalse(ExerciseImage.objects.get(pk=pk4).is_main)
         self.assertFalse(ExerciseImage.objects.get(pk=pk5).is_main)
 
+    def test_main_image_urls(self):
+        """
+        Tests that the exercise base stores the URLs of the current main image
+        """
+
+        exercise = Exercise.objects.get(pk=2)
+        pk1 = self.save_image(exercise, 'protestschwein.jpg')
+        pk2 = self.save_image(exercise, 'wildschwein.jpg')
+
+        image = ExerciseImage.objects.get(pk=pk1)
+        base = ExerciseBase.objects.get(pk=exercise.exercise_base_id)
+        self.assertEqual(base.main_image_url, image.image.url)
+        self.assertTrue(image.thumbnail_micro_url)
+        self.assertEqual(base.main_image_thumbnail_url, image.thumbnail_micro_url)
+
+        image.delete()
+        image = ExerciseImage.objects.get(pk=pk2)
+        base = ExerciseBase.objects.get(pk=exercise.exercise_base_id)
+        self.assertEqual(base.main_image_url, image.image.url)
+        self.assertEqual(base.main_image_thumbnail_url, image.thumbnail_micro_url)
+
+        image.delete()
+        base = ExerciseBase.objects.get(pk=exercise.exercise_base_id)
+        self.assertIsNone(base.main_image_url)
+        self.assertIsNone(base.main_image_thumbnail_url)
+
+    def test_main_image_urls_fixtures(self):
+        """
+        Tests that the main image URLs are also set for images loaded from fixtures
+        """
+        image = ExerciseImage.objects.get(pk=1)
+        base = ExerciseBase.objects.get(pk=1)
+        self.assertEqual(base.main_image_url, image.image.url)
+
 
 class AddExerciseImageTestCase(WgerAddTestCase):
     """
@@ -142,7 +191,94 @@ class DeleteExerciseImageTestCase(WgerDeleteTestCase):
     pk = 1
 
 
-# TODO: add POST and DELETE tests
+class ExerciseImageThumbnailCacheTestCase(WgerTestCase):
+    """
+    Tests the cache for the thumbnail URLs of exercise images
+    """
+
+    def test_cache_reset_on_save(self):
+        """
+        Tests that the cached thumbnail URLs are deleted when saving the image
+        """
+        key = cache_mapper.get_exercise_image_thumbnail(1, 'micro_cropped')
+        cache.set(key, 'foo')
+
+        ExerciseImage.objects.get(pk=1).save()
+        self.assertFalse(cache.get(key))
+
+    def test_cache_reset_on_delete(self):
+        """
+        Tests that the cached thumbnail URLs are deleted when deleting the image
+        """
+        key = cache_mapper.get_exercise_image_thumbnail(1, 'micro_cropped')
+        cache.set(key, 'foo')
+
+        ExerciseImage.objects.get(pk=1).delete()
+        self.assertFalse(cache.get(key))
+
+    def test_template_filter(self):
+        """
+        Tests that the template filter returns the cached thumbnail URL
+        """
+        image = ExerciseImage.objects.get(pk=1)
+        cache.set(cache_mapper.get_exercise_image_thumbnail(image, 'small'), '/media/foo.jpg')
+
+        template = Template('{% load wger_extras %}'
+                            '{{ image|exercise_image_thumbnail:"small" }}')
+        self.assertEqual(template.render(Context({'image': image})), '/media/foo.jpg')
+        self.assertEqual(template.render(Context({'image': None})), '')
+
+    def test_template_filter_failure(self):
+        """
+        Tests that the template filter does not cache failed thumbnails
+        """
+        # The file of the image in the fixtures does not exist
+        image = ExerciseImage.objects.get(pk=1)
+
+        template = Template('{% load wger_extras %}'
+                            '{{ image|exercise_image_thumbnail:"small" }}')
+        self.assertEqual(template.render(Context({'image': image})), '')
+        self.assertIsNone(cache.get(cache_mapper.get_exercise_image_thumbnail(image, 'small')))
+
+
+class ExerciseImageThumbnailsApiTestCase(WgerTestCase):
+    """
+    Tests the cache of the thumbnails endpoint of the exercise image API
+    """
+
+    def test_thumbnails_cache(self):
+        """
+        Tests that missing thumbnail URLs are generated and cached, and that a
+        second call is served from the cache
+        """
+        with open('wger/exercises/tests/protestschwein.jpg', 'rb') as inFile:
+            image = ExerciseImage()
+            image.exercise_base = Exercise.objects.get(pk=2).exercise_base
+            image.status = ExerciseImage.STATUS_ACCEPTED
+            image.image.save('protestschwein.jpg', File(inFile))
+            image.save()
+
+        keys = {
+            alias: cache_mapper.get_exercise_image_thumbnail(image, alias)
+            for alias in aliases.all()
+        }
+        self.assertFalse(cache.get_many(keys.values()))
+
+        url = reverse('exerciseimage-thumbnails', kwargs={'pk': image.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        thumbnails = response.json()
+        for alias, key in keys.items():
+            self.assertTrue(thumbnails[alias]['url'])
+            self.assertEqual(cache.get(key), thumbnails[alias]['url'])
+
+        with mock.patch('wger.exercises.api.views.get_thumbnailer') as mock_thumbnailer:
+            response = self.client.get(url)
+            mock_thumbnailer.return_value.get_thumbnail.assert_not_called()
+        self.assertEqual(response.json(), thumbnails)
+
+
+# TODO: add DELETE tests
 class ExerciseImagesApiTestCase(
     api_base_test.BaseTestCase,
     api_base_test.ApiBaseTestCase,
@@ -154,3 +290,31 @@ class ExerciseImagesApiTestCase(
     pk = 1
     private_resource = False
     resource = ExerciseImage
+
+    def test_post_image(self):
+        """
+        Tests that the author and status are set and the image is only saved once
+        """
+        saved = []
+
+        def count_saves(sender, instance, **kwargs):
+            saved.append(instance.pk)
+
+        post_save.connect(count_saves, sender=ExerciseImage)
+        self.get_credentials('admin')
+        try:
+            with open('wger/exercises/tests/protestschwein.jpg', 'rb') as inFile:
+                response = self.client.post(
+                    self.url,
+                    data={'exercise_base': 2, 'image': inFile},
+                    format='multipart',
+                )
+        finally:
+            post_save.disconnect(count_saves, sender=ExerciseImage)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        image = ExerciseImage.objects.get(pk=response.data['id'])
+        self.assertEqual(saved, [image.pk])
+        self.assertEqual(image.status, ExerciseImage.STATUS_ACCEPTED)
+        self.assertEqual(response.data['status'], ExerciseImage.STATUS_ACCEPTED)
+        self.assertEqual(image.license_author, 'testserver')
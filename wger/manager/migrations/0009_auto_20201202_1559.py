@@ -2,6 +2,11 @@
 
 from django.db import migrations, models
 
+RIR_CHOICES = [
+    (None, '------'), (0, 0), (0.5, 0.5), (1, 1), (1.5, 1.5), (2, 2), (2.5, 2.5), (3, 3),
+    (3.5, 3.5), (4, 4)
+]
+
 
 class Migration(migrations.Migration):
 
@@ -15,10 +20,7 @@ class Migration(migrations.Migration):
             name='rir',
             field=models.DecimalField(
                 blank=True,
-                choices=[
-                    (None, '------'), (0, 0), (0.5, 0.5), (1, 1), (1.5, 1.5), (2, 2), (2.5, 2.5),
-                    (3, 3), (3.5, 3.5), (4, 4)
-                ],
+                choices=RIR_CHOICES,
                 decimal_places=1,
                 max_digits=3,
                 null=True,
@@ -30,10 +32,7 @@ class Migration(migrations.Migration):
             name='rir',
             field=models.DecimalField(
                 blank=True,
-                choices=[
-                    (None, '------'), (0, 0), (0.5, 0.5), (1, 1), (1.5, 1.5), (2, 2), (2.5, 2.5),
-                    (3, 3), (3.5, 3.5), (4, 4)
-                ],
+                choices=RIR_CHOICES,
                 decimal_places=1,
                 max_digits=3,
                 null=True,
@@ -13,7 +13,9 @@
 # You should have received a copy of the GNU Affero General Public License
 
 # Standard Library
+import hashlib
 import logging
+import uuid
 
 # Django
 from django.core.cache import cache
@@ -31,6 +33,32 @@ def delete_template_fragment_cache(fragment_name='', vary_on=None):
     cache.delete(make_template_fragment_key(fragment_name, out))
 
 
+def delete_template_fragment_caches(fragment_names, vary_on_values):
+    """
+    Deletes the cache keys of several template fragments at once, once for each
+    of the vary_on values
+    """
+    cache.delete_many(
+        [
+            make_template_fragment_key(fragment_name, [vary_on])
+            for fragment_name in fragment_names for vary_on in vary_on_values
+        ]
+    )
+
+
+def get_language_ids():
+    """
+    Returns the IDs of all languages
+    """
+    # wger
+    from wger.core.models import Language
+
+    return cache.get_or_set(
+        cache_mapper.LANGUAGE_IDS_CACHE_KEY,
+        lambda: list(Language.objects.values_list('id', flat=True)),
+    )
+
+
 def reset_workout_canonical_form(workout_id):
     cache.delete(cache_mapper.get_workout_canonical(workout_id))
 
@@ -47,6 +75,24 @@ def reset_workout_log(user_pk, year, month, day=None):
     cache.delete(cache_mapper.get_workout_log_list(log_hash))
 
 
+def get_exercise_search_version():
+    """
+    Returns the current version of the cached exercise search results
+    """
+    return cache.get_or_set(
+        cache_mapper.EXERCISE_SEARCH_VERSION,
+        lambda: uuid.uuid4().hex,
+        None,
+    )
+
+
+def reset_exercise_search():
+    """
+    Invalidates all cached exercise search results
+    """
+    cache.delete(cache_mapper.EXERCISE_SEARCH_VERSION)
+
+
 class CacheKeyMapper(object):
     """
     Simple class for mapping the cache keys of different objects
@@ -54,11 +100,15 @@ class CacheKeyMapper(object):
 
     # Keys used by the cache
     LANGUAGE_CACHE_KEY = 'language-{0}'
+    LANGUAGE_IDS_CACHE_KEY = 'language-ids'
     LANGUAGE_CONFIG_CACHE_KEY = 'language-config-{0}-{1}'
     INGREDIENT_CACHE_KEY = 'ingredient-{0}'
     WORKOUT_CANONICAL_REPRESENTATION = 'workout-canonical-representation-{0}'
     WORKOUT_LOG_LIST = 'workout-log-hash-{0}'
     NUTRITION_CACHE_KEY = 'nutrition-cache-log-{0}'
+    EXERCISE_IMAGE_THUMBNAIL = 'exercise-image-thumbnail-{0}-{1}'
+    EXERCISE_SEARCH_VERSION = 'exercise-search-version'
+    EXERCISE_SEARCH = 'exercise-search-{0}-{1}'
 
     def get_pk(self, param):
         """
@@ -107,5 +157,20 @@ class CacheKeyMapper(object):
         """
         return self.NUTRITION_CACHE_KEY.format(self.get_pk(params))
 
+    def get_exercise_image_thumbnail(self, param, alias):
+        """
+        Return the cache key for the URL of an exercise image's thumbnail
+        """
+        return self.EXERCISE_IMAGE_THUMBNAIL.format(self.get_pk(param), alias)
+
+    def get_exercise_search(self, version, *params):
+        """
+        Return the cache key for the results of an exercise search
+
+        The parameters are hashed, since they contain user input
+        """
+        params_hash = hashlib.sha1('|'.join(str(p) for p in params).encode()).hexdigest()
+        return self.EXERCISE_SEARCH.format(version, params_hash)
+
 
 cache_mapper = CacheKeyMapper()